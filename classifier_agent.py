@@ -5,11 +5,15 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain.chat_models import init_chat_model
 from classifier_tool import (
     list_classifier_records,
+    stats_records,
+    list_record_changes,
     readfile
 )
 
 tools = [
     list_classifier_records,
+    stats_records,
+    list_record_changes,
     readfile
 ]
 
@@ -2,24 +2,76 @@ from langchain_core.tools import tool
 import db  # your db.py module
 import os
 import json
+from datetime import datetime
 
 
 CLASSIFIER_SOURCE = "classifier"
 
 
 @tool
-def list_classifier_records(source: str = None, type_: str = None, thread_id: str = None, limit: int = 50) -> list:
+def list_classifier_records(
+    source: str = None,
+    type_: str = None,
+    thread_id: str = None,
+    limit: int = 50,
+    since: str = None,
+    until: str = None,
+    include_archived: bool = False
+) -> list:
     """
     List all records with optional filters.
     :param source: Source of records to list (use only: "classifier","json","email","None").
     :param type_: Filter by type (optional).
     :param thread_id: Filter by thread ID (optional).
     :param limit: Max number of records to return.
+    :param since: Only records at or after this ISO timestamp (optional).
+    :param until: Only records before this ISO timestamp (optional).
+    :param include_archived: Also search records moved to the archive by retention.
     :return: List of record dicts.
     """
-    entries = db.list_entries(source=source, type_=type_, thread_id=thread_id, limit=limit)
+    for name, value in (("since", since), ("until", until)):
+        if value:
+            try:
+                datetime.fromisoformat(value)
+            except ValueError:
+                return {"error": f"'{name}' must be an ISO timestamp like 2025-05-30T12:00:00, got '{value}'."}
+
+    entries = db.list_entries(
+        source=source, type_=type_, thread_id=thread_id, limit=limit, since=since, until=until
+    )
+    if include_archived and len(entries) < limit:
+        entries += db.list_archived_entries(
+            source=source, type_=type_, thread_id=thread_id,
+            limit=limit - len(entries), since=since, until=until
+        )
     return entries
 
+@tool
+def stats_records(dimension: str = None) -> dict:
+    """
+    Get record counts and latest timestamps without listing the records.
+    Use this to answer "how many records of each type/source/thread?".
+    :param dimension: Restrict to one breakdown (use only: "source","type","thread","None").
+    :return: Dict with 'total', 'latest_timestamp' and 'by_source'/'by_type'/'by_thread' counts.
+    """
+    if not dimension or dimension == "None":
+        return db.get_stats()
+    if dimension not in db.STATS_DIMENSIONS:
+        return {"error": f"Unknown dimension '{dimension}', use one of: {', '.join(db.STATS_DIMENSIONS)}."}
+    return db.get_stats(dimension=dimension)
+
+@tool
+def list_record_changes(after_seq: int = 0, limit: int = 50) -> dict:
+    """
+    List record changes made after a cursor.
+    Each change has an 'op': "add", "update", "delete", or "archive" when
+    retention moved the record out of the live table into the archive.
+    :param after_seq: Cursor returned by the previous call (0 to start from the beginning).
+    :param limit: Max number of changes to return.
+    :return: Dict with 'changes' list and the next 'cursor'.
+    """
+    return db.get_changes(after_seq=after_seq, limit=limit)
+
 @tool
 def readfile(filename: str) -> str:
     """
@@ -1,12 +1,42 @@
 import sqlite3
 import json
-from datetime import datetime
+import os
+import gzip
+from datetime import datetime, timedelta, timezone
 from threading import Lock
 from typing import Optional, List, Dict, Any
 
 DB_PATH = "shared_memory.db"
+ARCHIVE_DIR = "archive"
+# Rows older than this many days are moved out of the hot DB by apply_retention()
+RETENTION_DAYS = int(os.getenv("MEMORY_RETENTION_DAYS", "90"))
 _lock = Lock()
 
+def _to_epoch(ts: str) -> int:
+    """
+    Convert an ISO timestamp (naive values are treated as UTC) to epoch seconds.
+    """
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+def _month_key(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m")
+
+def _archive_path(month: str) -> str:
+    return os.path.join(ARCHIVE_DIR, f"memory-{month}.jsonl.gz")
+
+def _row_to_entry(row) -> Dict[str, Any]:
+    return {
+        "id": row[0],
+        "source": row[1],
+        "type": row[2],
+        "timestamp": row[3],
+        "data": json.loads(row[4]),
+        "thread_id": row[5]
+    }
+
 def init_db():
     with _lock:
         conn = sqlite3.connect(DB_PATH)
@@ -18,12 +48,161 @@ def init_db():
             type TEXT NOT NULL,
             timestamp TEXT NOT NULL,
             data TEXT NOT NULL,
-            thread_id TEXT
+            thread_id TEXT,
+            ts_epoch INTEGER
+        )
+        """)
+        # Older databases predate ts_epoch: add it and backfill from the ISO text
+        cursor.execute("PRAGMA table_info(memory)")
+        if "ts_epoch" not in [col[1] for col in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE memory ADD COLUMN ts_epoch INTEGER")
+        cursor.execute("SELECT id, timestamp FROM memory WHERE ts_epoch IS NULL")
+        cursor.executemany(
+            "UPDATE memory SET ts_epoch = ? WHERE id = ?",
+            [(_to_epoch(ts), row_id) for row_id, ts in cursor.fetchall()]
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_ts_epoch ON memory (ts_epoch)")
+        # Per-key indexes keep the latest-timestamp rescan in _stats_remove cheap
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_source_ts ON memory (source, ts_epoch)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_type_ts ON memory (type, ts_epoch)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_thread_ts ON memory (thread_id, ts_epoch)")
+        # Append-only change feed: one row per add/update/delete, tailed by seq
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS memory_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entry_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            source TEXT,
+            type TEXT,
+            thread_id TEXT,
+            timestamp TEXT,
+            data TEXT,
+            changed_at TEXT NOT NULL
+        )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_changes_entry ON memory_changes (entry_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_changes_source_type ON memory_changes (source, type, seq)")
+        # Materialized aggregates kept in step with the memory table
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS memory_stats (
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            latest_timestamp TEXT,
+            latest_epoch INTEGER,
+            PRIMARY KEY (dimension, key)
         )
         """)
+        # latest_epoch came later; stats built without it are recomputed
+        cursor.execute("PRAGMA table_info(memory_stats)")
+        stats_columns = [col[1] for col in cursor.fetchall()]
+        if "latest_epoch" not in stats_columns:
+            cursor.execute("ALTER TABLE memory_stats ADD COLUMN latest_epoch INTEGER")
+            cursor.execute("DELETE FROM memory_stats")
+        cursor.execute("SELECT COUNT(*) FROM memory_stats")
+        if cursor.fetchone()[0] == 0:
+            _rebuild_stats(cursor)
         conn.commit()
+
+        # Retention frees pages with incremental_vacuum, which needs this mode;
+        # switching an existing file over takes one full VACUUM.
+        cursor.execute("PRAGMA auto_vacuum")
+        if cursor.fetchone()[0] != 2:
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            cursor.execute("VACUUM")
         conn.close()
 
+STATS_DIMENSIONS = ("all", "source", "type", "thread")
+
+def _stat_keys(source: str, type_: str, thread_id: Optional[str]) -> List[tuple]:
+    keys = [("all", "*"), ("source", source), ("type", type_)]
+    if thread_id is not None:
+        keys.append(("thread", thread_id))
+    return keys
+
+def _stat_column(dimension: str) -> Optional[str]:
+    return {"source": "source", "type": "type", "thread": "thread_id"}.get(dimension)
+
+def _rebuild_stats(cursor) -> None:
+    """
+    Recompute memory_stats from scratch (used to seed an existing database).
+    """
+    # With MAX() in the select list SQLite takes the bare timestamp column
+    # from the row holding the max ts_epoch
+    cursor.execute("DELETE FROM memory_stats")
+    cursor.execute("""
+        INSERT INTO memory_stats (dimension, key, count, latest_timestamp, latest_epoch)
+        SELECT 'all', '*', COUNT(*), timestamp, MAX(ts_epoch) FROM memory
+        WHERE EXISTS (SELECT 1 FROM memory)
+    """)
+    for dimension in ("source", "type", "thread"):
+        column = _stat_column(dimension)
+        cursor.execute(f"""
+            INSERT INTO memory_stats (dimension, key, count, latest_timestamp, latest_epoch)
+            SELECT ?, {column}, COUNT(*), timestamp, MAX(ts_epoch) FROM memory
+            WHERE {column} IS NOT NULL GROUP BY {column}
+        """, (dimension,))
+
+def _stats_add(cursor, source: str, type_: str, thread_id: Optional[str], ts: str) -> None:
+    epoch = _to_epoch(ts)
+    for dimension, key in _stat_keys(source, type_, thread_id):
+        cursor.execute("""
+            INSERT INTO memory_stats (dimension, key, count, latest_timestamp, latest_epoch)
+            VALUES (?, ?, 1, ?, ?)
+            ON CONFLICT(dimension, key) DO UPDATE SET
+                count = count + 1,
+                latest_timestamp = CASE WHEN latest_epoch IS NULL OR excluded.latest_epoch > latest_epoch
+                    THEN excluded.latest_timestamp ELSE latest_timestamp END,
+                latest_epoch = MAX(COALESCE(latest_epoch, excluded.latest_epoch), excluded.latest_epoch)
+        """, (dimension, key, ts, epoch))
+
+def _stats_remove(cursor, source: str, type_: str, thread_id: Optional[str], ts: str) -> None:
+    epoch = _to_epoch(ts)
+    for dimension, key in _stat_keys(source, type_, thread_id):
+        cursor.execute(
+            "UPDATE memory_stats SET count = count - 1 WHERE dimension = ? AND key = ?",
+            (dimension, key)
+        )
+        cursor.execute(
+            "DELETE FROM memory_stats WHERE dimension = ? AND key = ? AND count <= 0",
+            (dimension, key)
+        )
+        # Only rescan when the removed row was the one holding the latest timestamp
+        cursor.execute(
+            "SELECT latest_epoch FROM memory_stats WHERE dimension = ? AND key = ?",
+            (dimension, key)
+        )
+        row = cursor.fetchone()
+        if row and row[0] == epoch:
+            column = _stat_column(dimension)
+            if column:
+                cursor.execute(
+                    f"SELECT timestamp, ts_epoch FROM memory WHERE {column} = ? ORDER BY ts_epoch DESC LIMIT 1",
+                    (key,)
+                )
+            else:
+                cursor.execute("SELECT timestamp, ts_epoch FROM memory ORDER BY ts_epoch DESC LIMIT 1")
+            latest = cursor.fetchone() or (None, None)
+            cursor.execute(
+                "UPDATE memory_stats SET latest_timestamp = ?, latest_epoch = ? WHERE dimension = ? AND key = ?",
+                (latest[0], latest[1], dimension, key)
+            )
+
+def _log_change(
+    cursor,
+    entry_id: int,
+    op: str,
+    source: Optional[str],
+    type_: Optional[str],
+    thread_id: Optional[str],
+    ts: Optional[str],
+    data: Optional[str]
+) -> None:
+    cursor.execute("""
+        INSERT INTO memory_changes (entry_id, op, source, type, thread_id, timestamp, data, changed_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (entry_id, op, source, type_, thread_id, ts, data, datetime.utcnow().isoformat()))
+
 def add_entry(
     source: str,
     type_: str,
@@ -39,12 +218,15 @@ def add_entry(
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
         ts = timestamp or datetime.utcnow().isoformat()
+        payload = json.dumps(data)
         cursor.execute("""
-            INSERT INTO memory (source, type, timestamp, data, thread_id)
-            VALUES (?, ?, ?, ?, ?)
-        """, (source, type_, ts, json.dumps(data), thread_id))
-        conn.commit()
+            INSERT INTO memory (source, type, timestamp, data, thread_id, ts_epoch)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (source, type_, ts, payload, thread_id, _to_epoch(ts)))
         row_id = cursor.lastrowid
+        _log_change(cursor, row_id, "add", source, type_, thread_id, ts, payload)
+        _stats_add(cursor, source, type_, thread_id, ts)
+        conn.commit()
         conn.close()
         return row_id
 
@@ -59,14 +241,7 @@ def get_entry_by_id(entry_id: int) -> Optional[Dict[str, Any]]:
         row = cursor.fetchone()
         conn.close()
         if row:
-            return {
-                "id": row[0],
-                "source": row[1],
-                "type": row[2],
-                "timestamp": row[3],
-                "data": json.loads(row[4]),
-                "thread_id": row[5]
-            }
+            return _row_to_entry(row)
         return None
 
 def update_entry(
@@ -93,13 +268,33 @@ def update_entry(
             updates.append("thread_id = ?")
             params.append(thread_id)
         if not updates:
+            conn.close()
             return False  # nothing to update
 
+        cursor.execute(
+            "SELECT source, type, timestamp, thread_id FROM memory WHERE id = ?",
+            (entry_id,)
+        )
+        old = cursor.fetchone()
+        if old is None:
+            conn.close()
+            return False
+
         params.append(entry_id)
         query = f"UPDATE memory SET {', '.join(updates)} WHERE id = ?"
         cursor.execute(query, params)
-        conn.commit()
         updated = cursor.rowcount > 0
+        if updated:
+            source, type_, ts, old_thread_id = old
+            new_thread_id = thread_id if thread_id is not None else old_thread_id
+            if new_thread_id != old_thread_id:
+                _stats_remove(cursor, source, type_, old_thread_id, ts)
+                _stats_add(cursor, source, type_, new_thread_id, ts)
+            _log_change(
+                cursor, entry_id, "update", source, type_, new_thread_id, ts,
+                json.dumps(data) if data is not None else None
+            )
+        conn.commit()
         conn.close()
         return updated
 
@@ -111,9 +306,18 @@ def delete_entry(entry_id: int) -> bool:
     with _lock:
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
+        cursor.execute(
+            "SELECT source, type, timestamp, thread_id FROM memory WHERE id = ?",
+            (entry_id,)
+        )
+        old = cursor.fetchone()
         cursor.execute("DELETE FROM memory WHERE id = ?", (entry_id,))
-        conn.commit()
         deleted = cursor.rowcount > 0
+        if deleted:
+            source, type_, ts, old_thread_id = old
+            _stats_remove(cursor, source, type_, old_thread_id, ts)
+            _log_change(cursor, entry_id, "delete", source, type_, old_thread_id, ts, None)
+        conn.commit()
         conn.close()
         return deleted
 
@@ -121,10 +325,13 @@ def list_entries(
     source: Optional[str] = None,
     type_: Optional[str] = None,
     thread_id: Optional[str] = None,
-    limit: int = 100
+    limit: int = 100,
+    since: Optional[str] = None,
+    until: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     List entries with optional filters.
+    since/until are ISO timestamps bounding the entry time (inclusive / exclusive).
     """
     with _lock:
         conn = sqlite3.connect(DB_PATH)
@@ -141,24 +348,319 @@ def list_entries(
         if thread_id:
             filters.append("thread_id = ?")
             params.append(thread_id)
+        if since:
+            filters.append("ts_epoch >= ?")
+            params.append(_to_epoch(since))
+        if until:
+            filters.append("ts_epoch < ?")
+            params.append(_to_epoch(until))
         if filters:
             query += " WHERE " + " AND ".join(filters)
-        query += " ORDER BY timestamp DESC LIMIT ?"
+        query += " ORDER BY ts_epoch DESC, id DESC LIMIT ?"
         params.append(limit)
         cursor.execute(query, tuple(params))
         rows = cursor.fetchall()
         conn.close()
-        return [
+        return [_row_to_entry(row) for row in rows]
+
+def iter_entries(
+    source: str,
+    type_: str,
+    after_id: int = 0,
+    batch_size: int = 5000
+):
+    """
+    Yield entries of one (source, type) in id order, batch_size rows at a time.
+    Each entry also carries its "ts_epoch".
+    """
+    last_id = after_id
+    while True:
+        with _lock:
+            conn = sqlite3.connect(DB_PATH)
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM memory WHERE source = ? AND type = ? AND id > ?
+                ORDER BY id LIMIT ?
+            """, (source, type_, last_id, batch_size))
+            rows = cursor.fetchall()
+            conn.close()
+        if not rows:
+            return
+        batch = []
+        for row in rows:
+            entry = _row_to_entry(row)
+            entry["ts_epoch"] = row[6]
+            batch.append(entry)
+        yield batch
+        last_id = rows[-1][0]
+
+def sample_entries(source: str, type_: str, limit: int = 1000) -> List[Dict[str, Any]]:
+    """
+    Return a random sample of entries for one (source, type).
+    """
+    with _lock:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM memory WHERE source = ? AND type = ? ORDER BY RANDOM() LIMIT ?",
+            (source, type_, limit)
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        return [_row_to_entry(row) for row in rows]
+
+def list_source_types() -> List[tuple]:
+    """
+    Return the distinct (source, type) pairs currently stored.
+    """
+    with _lock:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT source, type FROM memory ORDER BY source, type")
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+
+def list_archived_entries(
+    source: Optional[str] = None,
+    type_: Optional[str] = None,
+    thread_id: Optional[str] = None,
+    limit: int = 100,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    List entries moved to the monthly archive files by apply_retention().
+    Only the month files overlapping since/until are opened.
+    """
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    since_epoch = _to_epoch(since) if since else None
+    until_epoch = _to_epoch(until) if until else None
+    first_month = _month_key(since_epoch) if since_epoch is not None else None
+    # until is exclusive, so a bound on a month boundary must not open that month
+    last_month = _month_key(until_epoch - 1) if until_epoch is not None else None
+
+    months = sorted(
+        (name[len("memory-"):-len(".jsonl.gz")] for name in os.listdir(ARCHIVE_DIR)
+         if name.startswith("memory-") and name.endswith(".jsonl.gz")),
+        reverse=True
+    )
+    results = []
+    for month in months:
+        if first_month and month < first_month:
+            continue
+        if last_month and month > last_month:
+            continue
+        matches = []
+        seen = set()
+        with gzip.open(_archive_path(month), "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                # An entry always lands in the same month file, so duplicates
+                # from a retried batch are caught per file
+                if entry["id"] in seen:
+                    continue
+                seen.add(entry["id"])
+                epoch = entry.pop("ts_epoch")
+                if since_epoch is not None and epoch < since_epoch:
+                    continue
+                if until_epoch is not None and epoch >= until_epoch:
+                    continue
+                if source and entry["source"] != source:
+                    continue
+                if type_ and entry["type"] != type_:
+                    continue
+                if thread_id and entry["thread_id"] != thread_id:
+                    continue
+                matches.append((epoch, entry))
+        matches.sort(key=lambda m: (m[0], m[1]["id"]), reverse=True)
+        results.extend(entry for _, entry in matches)
+        if len(results) >= limit:
+            break
+    return results[:limit]
+
+def apply_retention(
+    retention_days: int = RETENTION_DAYS,
+    batch_size: int = 500,
+    vacuum_pages: int = 1000
+) -> int:
+    """
+    Move entries older than retention_days to gzip-compressed monthly archive
+    files and drop them from the hot DB, one batch per transaction.
+    Returns the number of entries archived.
+    """
+    cutoff = int((datetime.now(timezone.utc) - timedelta(days=retention_days)).timestamp())
+    archived = 0
+    while True:
+        with _lock:
+            conn = sqlite3.connect(DB_PATH)
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM memory WHERE ts_epoch < ? ORDER BY ts_epoch LIMIT ?",
+                (cutoff, batch_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                conn.close()
+                break
+
+            # Write the archive before deleting so a crash never loses rows. A crash
+            # before the commit re-appends the batch next run; readers dedupe by id.
+            by_month: Dict[str, List[str]] = {}
+            for row in rows:
+                entry = _row_to_entry(row)
+                entry["ts_epoch"] = row[6]
+                by_month.setdefault(_month_key(row[6]), []).append(json.dumps(entry))
+            os.makedirs(ARCHIVE_DIR, exist_ok=True)
+            for month, lines in by_month.items():
+                with gzip.open(_archive_path(month), "at", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+
+            for row in rows:
+                entry_id, source, type_, ts, _, thread_id = row[:6]
+                cursor.execute("DELETE FROM memory WHERE id = ?", (entry_id,))
+                _stats_remove(cursor, source, type_, thread_id, ts)
+                # The archive file now owns the payload; don't keep a copy in the feed
+                cursor.execute(
+                    "UPDATE memory_changes SET data = NULL WHERE entry_id = ? AND data IS NOT NULL",
+                    (entry_id,)
+                )
+                _log_change(cursor, entry_id, "archive", source, type_, thread_id, ts, None)
+            conn.commit()
+            cursor.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})")
+            cursor.fetchall()
+            conn.close()
+        archived += len(rows)
+    return archived
+
+def compact_changes(up_to_seq: int, vacuum_pages: int = 1000) -> int:
+    """
+    Delete change feed rows with seq <= up_to_seq. Pass the lowest cursor any
+    consumer still needs; cursors at or above it keep working.
+    Returns the number of rows removed.
+    """
+    with _lock:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM memory_changes WHERE seq <= ?", (up_to_seq,))
+        removed = cursor.rowcount
+        conn.commit()
+        cursor.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})")
+        cursor.fetchall()
+        conn.close()
+        return removed
+
+def get_stats(dimension: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read the materialized record counts and latest timestamps.
+    Returns {"total": ..., "latest_timestamp": ..., "by_source": {...}, "by_type": {...}, "by_thread": {...}}
+    or only the requested dimension ("source", "type" or "thread").
+    """
+    with _lock:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        if dimension:
+            cursor.execute(
+                "SELECT dimension, key, count, latest_timestamp FROM memory_stats WHERE dimension = ?",
+                (dimension,)
+            )
+        else:
+            cursor.execute("SELECT dimension, key, count, latest_timestamp FROM memory_stats")
+        rows = cursor.fetchall()
+        conn.close()
+
+    stats: Dict[str, Any] = {}
+    if not dimension or dimension == "all":
+        stats["total"] = 0
+        stats["latest_timestamp"] = None
+    for dim, key, count, latest in rows:
+        if dim == "all":
+            stats["total"] = count
+            stats["latest_timestamp"] = latest
+        else:
+            stats.setdefault(f"by_{dim}", {})[key] = {"count": count, "latest_timestamp": latest}
+    return stats
+
+def get_changes(after_seq: int = 0, limit: int = 100) -> Dict[str, Any]:
+    """
+    Tail the change feed starting after the given cursor.
+    Returns {"changes": [...], "cursor": <seq to pass on the next call>}.
+    """
+    with _lock:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT seq, entry_id, op, source, type, thread_id, timestamp, data, changed_at
+            FROM memory_changes WHERE seq > ? ORDER BY seq LIMIT ?
+        """, (after_seq, limit))
+        rows = cursor.fetchall()
+        conn.close()
+        changes = [
             {
-                "id": row[0],
-                "source": row[1],
-                "type": row[2],
-                "timestamp": row[3],
-                "data": json.loads(row[4]),
-                "thread_id": row[5]
+                "seq": row[0],
+                "entry_id": row[1],
+                "op": row[2],
+                "source": row[3],
+                "type": row[4],
+                "thread_id": row[5],
+                "timestamp": row[6],
+                "data": json.loads(row[7]) if row[7] is not None else None,
+                "changed_at": row[8]
             }
             for row in rows
         ]
+        return {"changes": changes, "cursor": changes[-1]["seq"] if changes else after_seq}
+
+def has_rewrites(source: str, type_: str, after_seq: int) -> bool:
+    """
+    True if entries of this (source, type) were updated, deleted or archived after after_seq.
+    """
+    with _lock:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT EXISTS(
+                SELECT 1 FROM memory_changes
+                WHERE source = ? AND type = ? AND seq > ? AND op != 'add'
+            )
+        """, (source, type_, after_seq))
+        found = bool(cursor.fetchone()[0])
+        conn.close()
+        return found
+
+def latest_change_seq() -> int:
+    """
+    Return the seq of the newest change feed row (0 when nothing was ever logged).
+    Still correct after compact_changes() has emptied the feed.
+    """
+    with _lock:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT COALESCE(
+                (SELECT MAX(seq) FROM memory_changes),
+                (SELECT seq FROM sqlite_sequence WHERE name = 'memory_changes'),
+                0
+            )
+        """)
+        seq = cursor.fetchone()[0]
+        conn.close()
+        return seq
+
+def oldest_change_seq() -> int:
+    """
+    Return the lowest seq still kept in the change feed. Every change after
+    oldest_change_seq() - 1 is available; anything earlier may have been compacted.
+    """
+    with _lock:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute("SELECT MIN(seq) FROM memory_changes")
+        seq = cursor.fetchone()[0]
+        conn.close()
+    # An empty feed keeps nothing up to the last seq ever issued
+    return seq if seq is not None else latest_change_seq() + 1
 
 # Initialize DB when module loads
 init_db()
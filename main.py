@@ -1,13 +1,18 @@
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated
 from typing_extensions import TypedDict
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage,SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, ToolMessage,SystemMessage
+from langchain_core.messages import message_chunk_to_message
 
 from langgraph.checkpoint.memory import MemorySaver
 
+import db
+
 # --- Import your agents with tools and tools list ---
 
 
@@ -21,6 +26,8 @@ from email_tool import (
 )
 from classifier_tool import (
      list_classifier_records,
+    stats_records,
+    list_record_changes,
     readfile
 )
 from email_agent import email_llm_with_tools
@@ -31,6 +38,8 @@ from classifier_agent import classifier_llm_with_tools
 # --- 1. Define tools list ---
 tools = [
     list_classifier_records, 
+    stats_records,
+    list_record_changes,
     readfile,
     add_email_record, get_email_record, update_email_record,
     delete_email_record, list_email_records, search_email_records,
@@ -46,9 +55,90 @@ class State(TypedDict):
 memory = MemorySaver()
 from langchain_core.messages import SystemMessage, HumanMessage
 
-# --- 4. Agent functions ---
+# --- 4. Early tool dispatch ---
+class EarlyToolDispatcher:
+    """
+    Starts read-only tool calls while the model is still streaming; tool nodes
+    pick up the results by tool call id. Only pass tools without side effects.
+    """
+
+    def __init__(self, tools: list, max_workers: int = 4) -> None:
+        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.started = {}  # position in the current stream -> (id, name, args, future)
+        self.ready = {}  # tool call id of the finished message -> (name, args, future)
+
+    def reset(self) -> None:
+        """Drop every call that was started or finished but never consumed."""
+        for *_, future in list(self.started.values()) + list(self.ready.values()):
+            future.cancel()
+        self.started = {}
+        self.ready = {}
+
+    def start(self, position: int, tool_call_chunk: dict) -> None:
+        name = tool_call_chunk.get("name")
+        if position in self.started or name not in self.tools_by_name or not tool_call_chunk.get("args"):
+            return
+        try:
+            args = json.loads(tool_call_chunk["args"])
+        except json.JSONDecodeError:
+            return  # arguments still streaming
+        future = self.executor.submit(self.tools_by_name[name].invoke, args)
+        self.started[position] = (tool_call_chunk.get("id"), name, args, future)
+
+    def finish(self, message: AIMessage) -> None:
+        """Bind started calls to the tool calls of the finished message; cancel the rest."""
+        started = list(self.started.values())
+        self.started = {}
+        for tool_call in message.tool_calls:
+            for item in started:
+                call_id, name, args, future = item
+                if name == tool_call["name"] and args == tool_call["args"] and call_id in (None, tool_call["id"]):
+                    self.ready[tool_call["id"]] = (name, args, future)
+                    started.remove(item)
+                    break
+        for *_, future in started:
+            future.cancel()
+
+    def result(self, tool_call: dict):
+        name, args = tool_call["name"], tool_call["args"]
+        ready = self.ready.pop(tool_call["id"], None)
+        if ready is not None and ready[0] == name and ready[1] == args:
+            return ready[2].result()
+        return self.tools_by_name[name].invoke(args)
+
+def stream_model(llm, messages: list, dispatcher: EarlyToolDispatcher) -> AIMessage:
+    """
+    Stream the model response token by token, starting each read-only tool
+    call as soon as its arguments form a complete JSON object.
+    """
+    dispatcher.reset()
+    message = None
+    try:
+        for chunk in llm.stream(messages):
+            message = chunk if message is None else message + chunk
+            for position, tool_call_chunk in enumerate(message.tool_call_chunks):
+                dispatcher.start(position, tool_call_chunk)
+    except BaseException:
+        dispatcher.reset()
+        raise
+    result = message_chunk_to_message(message) if message is not None else AIMessage(content="")
+    dispatcher.finish(result)
+    return result
+
+# Only tools without side effects are started early: a write must not happen
+# before the model's message is complete and its ToolMessage exists.
+classifier_dispatcher = EarlyToolDispatcher(
+    [readfile, list_classifier_records, stats_records, list_record_changes]
+)
+agent_dispatcher = EarlyToolDispatcher([
+    get_email_record, list_email_records, search_email_records,
+    get_json_record, list_json_records, search_json_records,
+])
+
+# --- 5. Agent functions ---
 def classifier_chatbot(state: State) -> dict:
-    result = classifier_llm_with_tools.invoke(state["messages"])
+    result = stream_model(classifier_llm_with_tools, state["messages"], classifier_dispatcher)
     return {"messages": [result]}
 
 def email_chatbot(state: State) -> dict:
@@ -56,7 +146,7 @@ def email_chatbot(state: State) -> dict:
         HumanMessage(content="Please add email the previously read  data using the appropriate tool.")
     )
 
-    result = email_llm_with_tools.invoke(state["messages"])
+    result = stream_model(email_llm_with_tools, state["messages"], agent_dispatcher)
     # print("here1")
     return {"messages": state["messages"] + [result]}
 
@@ -66,16 +156,17 @@ def json_chatbot(state: State) -> dict:
         HumanMessage(content="Please store the previously read JSON data using the appropriate tool.")
     )
 
-    result = json_llm_with_tools.invoke(state["messages"])
+    result = stream_model(json_llm_with_tools, state["messages"], agent_dispatcher)
     # print("here1")
     return {"messages": state["messages"] + [result]}
 
-# --- 5. Tool caller node ---
+# --- 6. Tool caller node ---
 class BasicToolNode:
     """A node that runs the tools requested in the last AIMessage."""
 
-    def __init__(self, tools: list) -> None:
+    def __init__(self, tools: list, dispatcher: EarlyToolDispatcher = None) -> None:
         self.tools_by_name = {tool.name: tool for tool in tools}
+        self.dispatcher = dispatcher
 
     def __call__(self, inputs: dict):
         
@@ -88,7 +179,10 @@ class BasicToolNode:
         for tool_call in getattr(message, "tool_calls", []):
             tool_name = tool_call["name"]
             tool_args = tool_call["args"]
-            tool_result = self.tools_by_name[tool_name].invoke(tool_args)
+            if self.dispatcher is not None and tool_name in self.dispatcher.tools_by_name:
+                tool_result = self.dispatcher.result(tool_call)
+            else:
+                tool_result = self.tools_by_name[tool_name].invoke(tool_args)
             outputs.append(
                 ToolMessage(
                     content=json.dumps(tool_result),
@@ -98,21 +192,24 @@ class BasicToolNode:
             )
         return {"messages": outputs}
 
-tool_node = BasicToolNode(tools)
-read_tool=BasicToolNode([readfile])
-list_record_tool=BasicToolNode([list_classifier_records])
+tool_node = BasicToolNode(tools, agent_dispatcher)
+read_tool=BasicToolNode([readfile], classifier_dispatcher)
+list_record_tool=BasicToolNode([list_classifier_records], classifier_dispatcher)
+stats_record_tool=BasicToolNode([stats_records, list_record_changes], classifier_dispatcher)
 def router(state: State) -> str:
     last_msg = state["messages"][-1]
     # print(last_msg)
     if isinstance(last_msg, AIMessage):
-        tool_calls = last_msg.additional_kwargs
+        tool_calls = last_msg.tool_calls
         if tool_calls:
             
-            if 'readfile'==tool_calls['function_call'].get('name'):
+            if 'readfile'==tool_calls[0]['name']:
                 return "read_tool"
-            elif 'list_classifier_records'==tool_calls['function_call'].get('name'):
-                print(tool_calls['function_call'])
+            elif 'list_classifier_records'==tool_calls[0]['name']:
+                print(tool_calls[0])
                 return "list_record"
+            elif tool_calls[0]['name'] in ('stats_records', 'list_record_changes'):
+                return "stats_record"
             else:
                 return END
         else:
@@ -153,8 +250,8 @@ def from_readtool(state: State) -> str:
 def from_email_root(state: State) -> str:
     last_msg = state["messages"][-1]
    
-    if last_msg.additional_kwargs:
-        print(last_msg.additional_kwargs)
+    if getattr(last_msg, "tool_calls", None):
+        print(last_msg.tool_calls)
         return 'call_tools' 
     else:
         return 'input_email'
@@ -164,8 +261,8 @@ def from_email_root(state: State) -> str:
 def from_json_root(state: State) -> str:
     last_msg = state["messages"][-1]
    
-    if last_msg.additional_kwargs:
-        print(last_msg.additional_kwargs)
+    if getattr(last_msg, "tool_calls", None):
+        print(last_msg.tool_calls)
         return 'call_tools' 
     else:
         return 'input_json'
@@ -210,6 +307,7 @@ graph_builder.add_node("read_tool",read_tool)
 graph_builder.add_node("input_json",input_json)
 graph_builder.add_node("input_email",input_email)
 graph_builder.add_node("list_record",list_record_tool)
+graph_builder.add_node("stats_record",stats_record_tool)
 # Add routing after classifier
 graph_builder.add_conditional_edges("classifier", router)
 graph_builder.add_conditional_edges("read_tool", from_readtool)
@@ -219,6 +317,7 @@ graph_builder.add_edge("input_email", "email")
 
 graph_builder.add_edge("call_tools", END)
 graph_builder.add_edge("list_record", "classifier")
+graph_builder.add_edge("stats_record", "classifier")
 # After email, json, classifier go to call_tools to process tools if any
 graph_builder.add_conditional_edges("email", from_email_root)
 graph_builder.add_conditional_edges("json", from_json_root)
@@ -244,19 +343,37 @@ graph = graph_builder.compile(checkpointer=memory)
 def stream_graph_updates(user_input: str):
     messages_list = [HumanMessage(content=user_input)]
 
+    # "messages" yields LLM tokens as they arrive, "updates" the finished node outputs
     events = graph.stream(
         {"messages": messages_list},
         {"configurable": {"thread_id": "2"}},
+        stream_mode=["messages", "updates"],
     )
-    
-    for event in events:
+
+    step_start = time.perf_counter()
+    streamed_node = None
+    for mode, event in events:
+        if mode == "messages":
+            chunk, metadata = event
+            if isinstance(chunk, AIMessageChunk) and isinstance(chunk.content, str) and chunk.content:
+                if streamed_node is None:
+                    streamed_node = metadata.get("langgraph_node")
+                    ttft = time.perf_counter() - step_start
+                    print(f"[{streamed_node}] time to first token: {ttft:.2f}s")
+                    print("Assistant: ", end="")
+                print(chunk.content, end="", flush=True)
+            continue
+
         # print(event)
+        if streamed_node is not None:
+            print()
+            streamed_node = None
         for value in event.values():
             messages = value.get("messages", [])
             if messages:
                 assistant_message = messages[-1]
                 if isinstance(assistant_message, AIMessage):
-                    print("Assistant:", assistant_message.content)
+                    # Content was already printed token by token
                     messages_list.append(assistant_message)
                 elif isinstance(assistant_message, ToolMessage):
                     # Optional: handle tool message differently
@@ -266,9 +383,15 @@ def stream_graph_updates(user_input: str):
                     messages_list.append(assistant_message)
             else:
                 print("No messages returned from graph step")
+        step_start = time.perf_counter()
 
 # --- 9. Main interaction loop ---
 if __name__ == "__main__":
+    # Move rows past the retention window out of the hot DB before starting
+    archived = db.apply_retention()
+    if archived:
+        print(f"Archived {archived} records older than {db.RETENTION_DAYS} days")
+
     while True:
         try:
             user_input = input("User: ")
@@ -0,0 +1,312 @@
+import os
+import re
+import json
+from typing import Optional, List, Dict, Any
+
+import db  # your db.py module
+
+try:
+    import pyarrow as pa
+except ImportError:  # only needed for columnar snapshots
+    pa = None
+
+SNAPSHOT_DIR = "snapshots"
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+SAMPLE_SIZE = 1000
+BATCH_SIZE = 5000
+
+# Inferred field type -> Arrow type ("json" values are stored JSON-encoded)
+_ARROW_TYPES = {
+    "bool": "bool_",
+    "int64": "int64",
+    "float64": "float64",
+    "string": "string",
+    "json": "string",
+}
+
+
+class _SchemaChanged(Exception):
+    """New rows carry fields or types the current snapshot schema cannot hold."""
+
+    def __init__(self, schema: Dict[str, Optional[str]]) -> None:
+        super().__init__("snapshot schema changed")
+        self.schema = schema
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for columnar snapshots: pip install pyarrow")
+
+def _record_fields(data: Any) -> Dict[str, Any]:
+    """
+    Decode an entry's data into a dict of fields.
+    Tools often store the payload as a JSON string; anything that is not an
+    object ends up in a single "value" field.
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError:
+            return {"value": data}
+    if isinstance(data, dict):
+        return data
+    return {"value": data}
+
+def _value_type(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        # JSON integers are unbounded; keep the ones Arrow cannot hold as text
+        return "int64" if _INT64_MIN <= value <= _INT64_MAX else "string"
+    if isinstance(value, float):
+        return "float64"
+    if isinstance(value, str):
+        return "string"
+    return "json"
+
+def _merge_types(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if a is None:
+        return b
+    if b is None or a == b:
+        return a
+    if {a, b} == {"int64", "float64"}:
+        return "float64"
+    return "string"
+
+def _merge_schemas(a: Dict[str, Optional[str]], b: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    merged = dict(a)
+    for name, type_ in b.items():
+        merged[name] = _merge_types(merged.get(name), type_)
+    return dict(sorted(merged.items()))
+
+def infer_schema(entries: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    Derive a {field: type} schema from the data of the given entries.
+    Types are "bool", "int64", "float64", "string" or "json"; fields that are
+    only ever null stay None (unknown) so a later typed value can still claim
+    them. Unknown fields are written as all-null string columns.
+    """
+    fields: Dict[str, Optional[str]] = {}
+    for entry in entries:
+        for name, value in _record_fields(entry["data"]).items():
+            fields[name] = _merge_types(fields.get(name), _value_type(value))
+    return dict(sorted(fields.items()))
+
+def _arrow_schema(schema: Dict[str, Optional[str]]) -> "pa.Schema":
+    # Entry metadata is prefixed with "_" so it cannot clash with data fields
+    columns = [
+        pa.field("_id", pa.int64()),
+        pa.field("_ts", pa.timestamp("s", tz="UTC")),
+        pa.field("_thread_id", pa.string()),
+    ]
+    columns += [
+        pa.field(name, getattr(pa, _ARROW_TYPES[type_ or "string"])())
+        for name, type_ in schema.items()
+        if name not in ("_id", "_ts", "_thread_id")
+    ]
+    return pa.schema(columns)
+
+def _coerce(value: Any, type_: Optional[str]) -> Any:
+    if value is None or type_ is None:
+        return None
+    if type_ == "json":
+        return json.dumps(value)
+    if type_ == "string":
+        return value if isinstance(value, str) else json.dumps(value)
+    if isinstance(value, bool):
+        return value if type_ == "bool" else None
+    if type_ == "int64":
+        return value if isinstance(value, int) else None
+    if type_ == "float64":
+        return float(value) if isinstance(value, (int, float)) else None
+    return None
+
+def _record_batch(entries: List[Dict[str, Any]], schema: Dict[str, Optional[str]], arrow_schema: "pa.Schema") -> "pa.RecordBatch":
+    columns: Dict[str, list] = {field.name: [] for field in arrow_schema}
+    for entry in entries:
+        fields = _record_fields(entry["data"])
+        columns["_id"].append(entry["id"])
+        columns["_ts"].append(entry["ts_epoch"])
+        columns["_thread_id"].append(entry["thread_id"])
+        for name in arrow_schema.names[3:]:
+            columns[name].append(_coerce(fields.get(name), schema[name]))
+    arrays = [pa.array(columns[field.name], type=field.type) for field in arrow_schema]
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+
+def _snapshot_dir(source: str, type_: str) -> str:
+    def safe(name: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+    return os.path.join(SNAPSHOT_DIR, safe(source), safe(type_))
+
+def _load_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(directory, "manifest.json")
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _save_manifest(directory: str, manifest: Dict[str, Any]) -> None:
+    path = os.path.join(directory, "manifest.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def _write_segment(
+    path: str,
+    source: str,
+    type_: str,
+    schema: Dict[str, Optional[str]],
+    after_id: int,
+    check_schema: bool
+) -> tuple:
+    """
+    Stream entries with id > after_id into one Arrow IPC file, batch by batch.
+    Returns (rows written, last id). Empty segments are not kept.
+    """
+    arrow_schema = _arrow_schema(schema)
+    rows, last_id = 0, after_id
+    writer = pa.ipc.new_file(path, arrow_schema)
+    try:
+        for batch in db.iter_entries(source, type_, after_id=after_id, batch_size=BATCH_SIZE):
+            if check_schema:
+                merged = _merge_schemas(schema, infer_schema(batch))
+                if merged != schema:
+                    raise _SchemaChanged(merged)
+            writer.write_batch(_record_batch(batch, schema, arrow_schema))
+            rows += len(batch)
+            last_id = batch[-1]["id"]
+    except BaseException:
+        writer.close()
+        os.remove(path)
+        raise
+    writer.close()
+    if rows == 0:
+        os.remove(path)
+    return rows, last_id
+
+def _rebuild(
+    source: str,
+    type_: str,
+    directory: str,
+    old_manifest: Optional[Dict[str, Any]],
+    seq: int,
+    schema: Optional[Dict[str, Optional[str]]] = None
+) -> Dict[str, Any]:
+    generation = old_manifest["generation"] + 1 if old_manifest else 0
+    schema = _merge_schemas(infer_schema(db.sample_entries(source, type_, SAMPLE_SIZE)), schema or {})
+    name = f"part-{generation:04d}-00000.arrow"
+    # The sample may miss fields or types; widen the schema and restart until every row fits
+    while True:
+        try:
+            rows, last_id = _write_segment(
+                os.path.join(directory, name), source, type_, schema, after_id=0, check_schema=True
+            )
+            break
+        except _SchemaChanged as e:
+            schema = e.schema
+    manifest = {
+        "source": source,
+        "type": type_,
+        "schema": schema,
+        "generation": generation,
+        "segments": [name] if rows else [],
+        "rows": rows,
+        "last_id": last_id,
+        "last_seq": seq,
+    }
+    _save_manifest(directory, manifest)
+    for segment in (old_manifest or {}).get("segments", []):
+        os.remove(os.path.join(directory, segment))
+    return manifest
+
+def refresh_snapshot(source: str, type_: str) -> Dict[str, Any]:
+    """
+    Create or refresh the columnar snapshot of one (source, type).
+    New rows are appended as a new segment; updates, deletes, archived rows or
+    an incompatible schema trigger a full rebuild.
+    Returns the snapshot manifest.
+    """
+    _require_pyarrow()
+    directory = _snapshot_dir(source, type_)
+    os.makedirs(directory, exist_ok=True)
+    manifest = _load_manifest(directory)
+    # Read the feed position first: adds are tracked by id, so rows landing
+    # while we export are never lost, only picked up again by id next time.
+    seq = db.latest_change_seq()
+
+    # If the feed was compacted past last_seq, rewrites may be gone: rebuild
+    if (
+        manifest is None
+        or db.oldest_change_seq() > manifest["last_seq"] + 1
+        or db.has_rewrites(source, type_, manifest["last_seq"])
+    ):
+        return _rebuild(source, type_, directory, manifest, seq)
+
+    name = f"part-{manifest['generation']:04d}-{len(manifest['segments']):05d}.arrow"
+    try:
+        rows, last_id = _write_segment(
+            os.path.join(directory, name), source, type_, manifest["schema"],
+            after_id=manifest["last_id"], check_schema=True
+        )
+    except _SchemaChanged as e:
+        return _rebuild(source, type_, directory, manifest, seq, schema=e.schema)
+
+    if rows:
+        manifest["segments"].append(name)
+        manifest["rows"] += rows
+        manifest["last_id"] = last_id
+    manifest["last_seq"] = seq
+    _save_manifest(directory, manifest)
+    return manifest
+
+def compact_change_feed(up_to_seq: int) -> int:
+    """
+    Compact the change feed up to up_to_seq, but never past the oldest
+    snapshot's last_seq, so snapshots keep seeing every later rewrite.
+    Returns the number of feed rows removed.
+    """
+    if os.path.isdir(SNAPSHOT_DIR):
+        for root, _, files in os.walk(SNAPSHOT_DIR):
+            if "manifest.json" in files:
+                up_to_seq = min(up_to_seq, _load_manifest(root)["last_seq"])
+    return db.compact_changes(up_to_seq)
+
+def refresh_all_snapshots() -> List[Dict[str, Any]]:
+    """
+    Refresh the snapshot of every (source, type) currently stored.
+    """
+    return [refresh_snapshot(source, type_) for source, type_ in db.list_source_types()]
+
+def scan_snapshot(
+    source: str,
+    type_: str,
+    columns: Optional[List[str]] = None,
+    where: Any = None
+) -> "pa.Table":
+    """
+    Memory-map the snapshot segments of one (source, type) and return them as
+    an Arrow table, optionally projected to columns and filtered with a
+    pyarrow.compute expression, e.g. pc.field("amount") > 100.
+    Builds or refreshes the snapshot first if the change feed has moved past it.
+    """
+    _require_pyarrow()
+    directory = _snapshot_dir(source, type_)
+    manifest = _load_manifest(directory)
+    if manifest is None or db.latest_change_seq() > manifest["last_seq"]:
+        manifest = refresh_snapshot(source, type_)
+    tables = [
+        pa.ipc.open_file(pa.memory_map(os.path.join(directory, segment))).read_all()
+        for segment in manifest["segments"]
+    ]
+    table = pa.concat_tables(tables) if tables else _arrow_schema(manifest["schema"]).empty_table()
+    if where is not None:
+        table = table.filter(where)
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+if __name__ == "__main__":
+    for manifest in refresh_all_snapshots():
+        print(f"{manifest['source']}/{manifest['type']}: {manifest['rows']} rows, {len(manifest['segments'])} segments")